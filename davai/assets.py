@@ -1,22 +1,151 @@
-import os
 import logging
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 from davai.code_block import CodeBlock
 
 class Assets(list):
     """
     Custom class to manage a list of CodeBlock objects.
+    Lookups derived from the list are cached and dropped whenever the list is mutated.
     """
 
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._invalidate()
+
+    def __reduce__(self):
+        # Pickle and copy from the items alone, so the caches are rebuilt from scratch
+        # rather than restored alongside (and after) items added through extend()
+        return (Assets, (list(self),))
+
+    def _invalidate(self):
+        """Drops cached lookups; called after every in-place mutation."""
+        self._choices = None  # Cached index -> base name mapping used by match()
+        self._positions = None  # Cached path -> index mapping used by get() and position()
+        self._paths = None  # Cached list of asset paths returned by paths
+
+    def _index_from(self, start):
+        """
+        Adds assets appended from position start onwards to whichever path lookups are already built,
+        keeping the first position per path. Only for append/extend; each lookup builds itself from scratch.
+        """
+        if self._positions is not None:
+            for i in range(start, len(self)):
+                self._positions.setdefault(self[i].head.path, i)
+        if self._paths is not None:
+            self._paths.extend(self[i].head.path for i in range(start, len(self)))
+
+    def append(self, asset):
+        super().append(asset)
+        self._choices = None
+        self._index_from(len(self) - 1)
+
+    def extend(self, assets):
+        start = len(self)
+        super().extend(assets)
+        self._choices = None
+        self._index_from(start)
+
+    def insert(self, i, asset):
+        super().insert(i, asset)
+        self._invalidate()
+
+    def remove(self, asset):
+        super().remove(asset)
+        self._invalidate()
+
+    def pop(self, i=-1):
+        asset = super().pop(i)
+        self._invalidate()
+        return asset
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, i, asset):
+        # Replacing an asset with one for the same path leaves both lookups valid
+        same_path = isinstance(i, int) and self[i].head.path == asset.head.path
+        super().__setitem__(i, asset)
+        if not same_path:
+            self._invalidate()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._invalidate()
+
+    def __iadd__(self, assets):
+        self.extend(assets)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._invalidate()
+        return self
+
+    def copy(self):
+        """Returns a shallow copy as an Assets instance rather than a plain list, keeping cached lookups."""
+        assets = Assets(self)
+        assets._choices = self._choices  # Only ever replaced, never updated in place, so safe to share
+        if self._positions is not None:
+            assets._positions = dict(self._positions)
+        if self._paths is not None:
+            assets._paths = list(self._paths)
+        return assets
+
     @property
     def paths(self):
-        """Returns a list of paths from the CodeBlock head path attributes."""
-        return [asset.head.path for asset in self]
+        """
+        Returns a list of paths from the CodeBlock head path attributes.
+        The list is cached and kept up to date on append/extend, so callers must not modify it.
+        """
+        if self._paths is None:
+            self._paths = [asset.head.path for asset in self]
+        return self._paths
+
+    def position(self, path):
+        """Returns the index of the first asset with the given path, or None if there isn't one."""
+        if self._positions is None:
+            positions = {}
+            for i, asset in enumerate(self):
+                positions.setdefault(asset.head.path, i)
+            self._positions = positions
+        return self._positions.get(path)
+
+    def get(self, path):
+        """Returns the first asset with the given path, or None if there isn't one."""
+        i = self.position(path)
+        return None if i is None else self[i]
+
+    @property
+    def choices(self):
+        """Returns a mapping of asset index to lowercased base name, built once per mutation."""
+        if self._choices is None:
+            self._choices = {i: asset.head.base_name for i, asset in enumerate(self)}
+        return self._choices
+
+    def _substring_matches(self, processed_text):
+        """
+        Returns the indexes of assets whose base name is contained in the lowercased text, or vice versa.
+        These are perfect partial matches, found with plain substring checks rather than the fuzzy scorer.
+        """
+        if not processed_text:
+            return []  # The empty string is in every name, but an empty query shouldn't match anything
+        return [i for i, base_name in self.choices.items()
+                if base_name and (base_name in processed_text or processed_text in base_name)]
 
-    def match(self, text, threshold=0.7):
+    def match(self, text, threshold=0.75):
         """
         Matches assets based on fuzzy matching of the provided text input.
         Compares the full text against each asset path in the CodeBlock head objects.
+        Assets named in the text are returned directly; the fuzzy scorer only runs when there are none.
         Returns an instance of Assets containing the matched assets.
         """
         matched_assets = Assets()
@@ -24,20 +153,56 @@ class Assets(list):
         # Preprocess the input text to make it lowercase
         processed_text = text.lower()
 
-        # Iterate over each asset and calculate the fuzzy matching score
-        for asset in self:
-            # Get the base name of the asset (without the extension) and lowercase it
-            asset_base = os.path.splitext(os.path.basename(asset.head.path))[0].lower()
+        matches = [(None, 100.0, i) for i in self._substring_matches(processed_text)]
 
-            # Calculate the fuzzy matching score
-            score = fuzz.partial_ratio(asset_base, processed_text)
+        # Fall back to scoring everything in a single call; score_cutoff lets the scorer bail out early
+        if not matches and self.choices:
+            matches = process.extract(processed_text, self.choices,
+                                      scorer=fuzz.partial_ratio,
+                                      score_cutoff=threshold * 100,
+                                      limit=None)
 
-            # Normalize the score to create a probability (score is between 0 and 100, so divide by 100)
-            probability = score / 100.0
-
-            # If the probability meets or exceeds the threshold, log it and add the asset to matched_assets
-            if probability >= threshold:
-                logging.info(f"Asset: {asset.head.path}, Score: {probability:.2f}")
-                matched_assets.append(asset)
+        # Restore asset order
+        for _, score, i in sorted(matches, key=lambda match: match[2]):
+            asset = self[i]
+            logging.info("Asset: %s, Score: %.2f", asset.head.path, score / 100.0)
+            matched_assets.append(asset)
 
         return matched_assets
+
+    def match_many(self, texts, threshold=0.75):
+        """
+        Matches assets against several text inputs at once.
+        Texts without a substring match are scored against every asset in a single multi-threaded call.
+        Returns a list with one Assets instance per text, as match() would return.
+        """
+        processed_texts = [text.lower() for text in texts]
+        results = [Assets() for _ in texts]
+
+        # Substring matches first, collecting the texts that still need the fuzzy scorer
+        unmatched = []
+        for k, processed_text in enumerate(processed_texts):
+            positions = self._substring_matches(processed_text)
+            if not positions:
+                unmatched.append(k)
+            for i in positions:
+                asset = self[i]
+                logging.info("Asset: %s, Score: 1.00", asset.head.path)
+                results[k].append(asset)
+
+        if not unmatched or not self.choices:
+            return results
+
+        # Scores below the cutoff come back as zero
+        scores = process.cdist([processed_texts[k] for k in unmatched], list(self.choices.values()),
+                               scorer=fuzz.partial_ratio,
+                               score_cutoff=threshold * 100,
+                               workers=-1)
+
+        for k, row in zip(unmatched, scores):
+            for i in row.nonzero()[0]:
+                asset = self[i]
+                logging.info("Asset: %s, Score: %.2f", asset.head.path, row[i] / 100.0)
+                results[k].append(asset)
+
+        return results
@@ -1,9 +1,11 @@
 import os
+import sys
+import inspect
 import gnureadline as readline
 import logging
 import cmd
-import difflib
 from davai.code_block import CodeBlock, Head, Body
+from davai.diff import unified_diff
 from davai.git import Git
 from davai.requests import CodeUpdateRequest, CodeResetRequest, CodeQueryRequest
 from davai.responses import CodeResponse, BaseResponse
@@ -19,8 +21,41 @@ class BaseCLI(cmd.Cmd):
         self.git.fetch()  # Load assets from the filesystem into memory
         self.asset_paths = set()  # Initialize the asset_paths set
         self.transport_func = transport_func  # Set the transport function
+        # Transports taking an on_text callback can hand over response text as it streams in
+        self.transport_streams = "on_text" in inspect.signature(transport_func).parameters
+
+    def call_transport(self, request_text, echo=False):
+        """
+        Calls the transport function and returns the response text.
+        With echo set, the response is shown to the user: streamed through the on_text callback
+        if the transport supports streaming, or printed in full once it returns otherwise.
+        """
+        if not echo or not self.transport_streams:
+            response_text = self.transport_func(request_text)
+            if echo:
+                print(response_text)
+            return response_text
+
+        streamed = []
+
+        def on_text(text):
+            streamed.append(text)
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        response_text = self.transport_func(request_text, on_text=on_text)
+        if streamed:
+            print()  # End the streamed output with a newline
+        else:
+            print(response_text)
+        return response_text
 
     def preloop(self):
+        # Scripted runs have no use for history, so skip the file I/O entirely
+        self.interactive = sys.stdin.isatty()
+        if not self.interactive:
+            return
+
         # Ensure the directory for the history file exists
         history_dir = os.path.dirname(self.HISTORY_FILE)
         if not os.path.exists(history_dir):
@@ -34,24 +69,30 @@ class BaseCLI(cmd.Cmd):
             except FileNotFoundError:
                 pass 
 
+        # Remember where this session's history starts, so only new lines get saved
+        self.history_start = readline.get_current_history_length()
+
     def postloop(self):
-        # Save history to the history file
+        if not self.interactive:
+            return
+
+        # Append this session's history to the history file, or create it
         try:
-            readline.write_history_file(self.HISTORY_FILE)
+            if os.path.exists(self.HISTORY_FILE):
+                new_lines = readline.get_current_history_length() - self.history_start
+                readline.append_history_file(new_lines, self.HISTORY_FILE)
+            else:
+                readline.write_history_file(self.HISTORY_FILE)
             logging.info(f"History saved to {self.HISTORY_FILE}")
         except FileNotFoundError:
             pass
 
-    def print_diff(self, old_code, new_code):
+    def print_diff(self, old_lines, new_lines):
         """
-        Prints a git-like diff between two pieces of code, highlighting changes.
+        Prints a git-like diff between two pieces of code, given as lists of lines, highlighting changes.
         """
-        # Split the code into lines for easier processing
-        old_lines = old_code.splitlines(keepends=True)
-        new_lines = new_code.splitlines(keepends=True)
-        
-        # Create a unified diff using difflib
-        diff = difflib.unified_diff(old_lines, new_lines, fromfile='old_code', tofile='new_code')
+        # Create a unified diff, only matching the region that changed
+        diff = unified_diff(old_lines, new_lines, fromfile='old_code', tofile='new_code')
         
         # ANSI escape codes for colors
         GREEN = '\033[92m'
@@ -79,8 +120,9 @@ class BaseCLI(cmd.Cmd):
             logging.error(f"Invalid action: {action}")
             return
 
-        # Filter assets based on self.asset_paths
-        matching_assets = [asset for asset in self.git.assets if asset.head.path in self.asset_paths]
+        # Look up each tracked path in the asset index, keeping the assets in their original order
+        positions = [self.git.assets.position(path) for path in self.asset_paths]
+        matching_assets = [self.git.assets[i] for i in sorted(i for i in positions if i is not None)]
         
         if not matching_assets:
             logging.info("No matching assets found.")
@@ -155,7 +197,7 @@ class BaseCLI(cmd.Cmd):
             # Process new assets
             for new_asset in new_assets:
                 # Check if the asset already exists in git assets
-                existing_asset = next((asset for asset in self.git.assets if asset.head.path == new_asset.head.path), None)
+                existing_asset = self.git.assets.get(new_asset.head.path)
 
                 if existing_asset:
                     # If the new asset body is the same as the existing body, skip it
@@ -165,7 +207,7 @@ class BaseCLI(cmd.Cmd):
 
                     # Print the diff between the old and new versions
                     print(f"Diff for {new_asset.head.path}:")
-                    self.print_diff(existing_asset.body.code, new_asset.body.code)
+                    self.print_diff(existing_asset.body.lines, new_asset.body.lines)
 
                     # Query the user for confirmation to integrate the asset
                     user_input = input(f"Integrate {new_asset.head.path}? (y/n): ").strip().lower()
@@ -211,15 +253,12 @@ class BaseCLI(cmd.Cmd):
             # Save the request
             request.save()
 
-            # Call the transport function
-            response_text = self.transport_func(request.request_text)
+            # Call the transport function, showing the response to the user
+            response_text = self.call_transport(request.request_text, echo=True)
 
             # Handle the response using BaseResponse
             response = BaseResponse(response_text)
             response.save()
-
-            # Print the response text to stdout
-            print(response_text)
             logging.info("Query response received and displayed.")
 
         except RuntimeError as error:
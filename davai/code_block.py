@@ -1,12 +1,32 @@
+import os
 import re
+import sys
+from dataclasses import dataclass, field
 
+# Matches a JS/TS/Dart comment (// src/Hello.js) or a CSS comment (/* src/styles.css */)
+_COMMENT_RE = re.compile(r"^(?://\s*(src/[\w\d/_-]+\.(?:js|ts|dart))|/\*\s*(src/[\w\d/_-]+\.css)\s*\*/)")
+_COMMENT_PREFIXES = ("//", "/*")  # Only lines starting with one of these can match _COMMENT_RE
+
+# Markdown code types and comment templates by file extension
+_EXT_TO_CODE_TYPE = {".js": "javascript", ".ts": "typescript", ".dart": "dart", ".css": "css"}
+_EXT_TO_COMMENT = {".js": "// {}\n", ".ts": "// {}\n", ".dart": "// {}\n", ".css": "/* {} */\n"}
+
+@dataclass(frozen=True, slots=True)
 class Head:
     """
     Class representing the head (path) of a code block.
     This class manages the parsing and rendering of a file path as a comment.
+    Heads are immutable, and their paths are interned since the same paths recur across fetches and responses.
     """
-    def __init__(self, path):
-        self.path = path
+    path: str
+    _ext: str = field(init=False, repr=False, compare=False)  # File extension, used to pick the code type and comment style
+    _base_name: str = field(default=None, init=False, repr=False, compare=False)  # Cached result of base_name
+    _comment: str = field(default=None, init=False, repr=False, compare=False)  # Cached result of as_comment()
+
+    def __post_init__(self):
+        # The dataclass is frozen, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "path", sys.intern(self.path))
+        object.__setattr__(self, "_ext", os.path.splitext(self.path)[1])
 
     @staticmethod
     def from_comment(comment):
@@ -15,21 +35,23 @@ class Head:
         Extracts the asset path from the comment based on the expected comment format.
         Supports JS, CSS, Dart, and TypeScript files.
         """
-        # Check for JS comment style: // src/Hello.js or // src/Hello.ts
-        js_ts_pattern = r"^//\s*(src/[\w\d/_-]+\.(js|ts|dart))"
-        # Check for CSS comment style: /* src/styles.css */
-        css_pattern = r"^/\*\s*(src/[\w\d/_-]+\.css)\s*\*/"
-
-        # Match the comment pattern for JS, TS, Dart, or CSS
-        js_ts_match = re.match(js_ts_pattern, comment.strip())
-        css_match = re.match(css_pattern, comment.strip())
+        comment = comment.strip()
+        if not comment.startswith(_COMMENT_PREFIXES):
+            return None  # Not a comment, so no need to run the regex
+        match = _COMMENT_RE.match(comment)
+        if match:
+            return Head(match.group(1) or match.group(2))  # JS/TS/Dart path or CSS path
+        return None  # No valid asset path found
 
-        if js_ts_match:
-            return Head(js_ts_match.group(1))  # Return Head with JS/TS/Dart path
-        elif css_match:
-            return Head(css_match.group(1))  # Return Head with CSS path
-        else:
-            return None  # No valid asset path found
+    @property
+    def base_name(self):
+        """
+        Returns the lowercased file name without its extension, as used for fuzzy matching.
+        Computed once per Head.
+        """
+        if self._base_name is None:
+            object.__setattr__(self, "_base_name", os.path.splitext(os.path.basename(self.path))[0].lower())
+        return self._base_name
 
     @property
     def code_type(self):
@@ -37,35 +59,40 @@ class Head:
         Returns the Markdown-compatible code type based on the file extension.
         Supports JavaScript, TypeScript, Dart, and CSS.
         """
-        if self.path.endswith(".js"):
-            return "javascript"
-        elif self.path.endswith(".ts"):
-            return "typescript"
-        elif self.path.endswith(".dart"):
-            return "dart"
-        elif self.path.endswith(".css"):
-            return "css"
-        else:
-            return ""  # Fallback for unknown types
-        
+        return _EXT_TO_CODE_TYPE.get(self._ext, "")  # Empty fallback for unknown types
+
     def as_comment(self):
         """
         Renders the path as a comment based on the file type (JS, TS, Dart, or CSS).
+        The rendering is cached, since a Head's path doesn't change.
         """
-        if self.path.endswith(".js") or self.path.endswith(".ts") or self.path.endswith(".dart"):
-            return f"// {self.path}\n"
-        elif self.path.endswith(".css"):
-            return f"/* {self.path} */\n"
-        else:
-            return f"# {self.path}\n"  # Fallback for other file types
+        if self._comment is None:
+            # Hash comments are the fallback for other file types
+            object.__setattr__(self, "_comment", _EXT_TO_COMMENT.get(self._ext, "# {}\n").format(self.path))
+        return self._comment
 
 
+@dataclass(frozen=True, slots=True)
 class Body:
     """
     Class representing the body (code content) of a code block.
+    Bodies are immutable; changed code means a new Body.
     """
-    def __init__(self, code):
-        self.code = self._extract_body(code)
+    code: str
+    _lines: list = field(default=None, init=False, repr=False, compare=False)  # Cached result of lines
+
+    def __post_init__(self):
+        # The dataclass is frozen, so the extracted code is set through object.__setattr__
+        object.__setattr__(self, "code", self._extract_body(self.code))
+
+    @property
+    def lines(self):
+        """
+        Returns the code split into lines, keeping line endings. Computed once per Body.
+        """
+        if self._lines is None:
+            object.__setattr__(self, "_lines", self.code.splitlines(keepends=True))
+        return self._lines
 
     def _extract_body(self, code):
         """
@@ -73,19 +100,20 @@ class Body:
         Stops ignoring once the first non-blank/non-comment line is encountered.
         """
         lines = code.split("\n")
-        body_lines = []
-        start_processing = False
 
-        for line in lines:
+        # Find the first non-blank line that isn't a header comment
+        start = len(lines)
+        for i, line in enumerate(lines):
             stripped_line = line.strip()
+            if not stripped_line:
+                continue
+            if Head.from_comment(stripped_line):
+                continue
+            start = i
+            break
 
-            # Start adding lines once we encounter a non-blank/non-comment line
-            if not start_processing and stripped_line and not Head.from_comment(stripped_line):
-                start_processing = True
-            
-            # Add the line if we've started processing
-            if start_processing:
-                body_lines.append(line)
+        # Slice once rather than collecting lines one by one
+        body_lines = lines[start:]
 
         # Dedent the body lines to remove any consistent indentation
         if body_lines:
@@ -108,13 +136,20 @@ class CodeBlock:
     def __init__(self, head, body):
         self.head = head  # Expecting a Head object
         self.body = body  # Expecting a Body object
+        self._rendered = None  # Cached rendering, along with the (path, code) it was rendered from
+        self._rendered_from = None
 
     def __repr__(self):
         """
         Renders the code block with the head as a comment in the first line and body as the code.
         The output is enclosed in Markdown-style backticks with the appropriate code type.
         """
-        return f"```{self.head.code_type}\n{self.head.as_comment()}{self.body.code}\n```"
+        # Re-render only if the path or code changed since the last call
+        rendered_from = (self.head.path, self.body.code)
+        if self._rendered_from != rendered_from:
+            self._rendered = f"```{self.head.code_type}\n{self.head.as_comment()}{self.body.code}\n```"
+            self._rendered_from = rendered_from
+        return self._rendered
 
     @staticmethod
     def parse(code_block):
@@ -123,11 +158,8 @@ class CodeBlock:
         the asset name from the comment.
         Returns an instance of CodeBlock.
         """
-        # Split the code block into lines
-        code_block_lines = code_block.split("\n")
-
-        # Find the first non-blank line to use as the comment
-        first_line = next((line.strip() for line in code_block_lines if line.strip()), None)
+        # The first non-blank line is the comment; lstrip skips leading blank lines without splitting the block
+        first_line, _, rest = code_block.lstrip().partition("\n")
 
         if not first_line:
             return None  # Return None if no non-blank line (comment) is found
@@ -135,7 +167,7 @@ class CodeBlock:
         head = Head.from_comment(first_line)
 
         if head:
-            # Pass the entire code block content to the Body constructor
-            body = Body("\n".join(code_block_lines))
+            # The comment line is consumed here, so the Body only has to look at what follows it
+            body = Body(rest)
             return CodeBlock(head, body)
         return None
@@ -0,0 +1,159 @@
+import bisect
+import difflib
+
+def _append(codes, tag, i1, i2, j1, j2):
+    """Appends an opcode, skipping empty ones and merging adjacent equal runs."""
+    if i1 == i2 and j1 == j2:
+        return
+    if tag == "equal" and codes and codes[-1][0] == "equal":
+        codes[-1] = ("equal", codes[-1][1], i2, codes[-1][3], j2)
+        return
+    codes.append((tag, i1, i2, j1, j2))
+
+def _common_ends(a, b, alo, ahi, blo, bhi):
+    """Returns the number of lines shared at the start and at the end of a[alo:ahi] and b[blo:bhi]."""
+    n = min(ahi - alo, bhi - blo)
+    head = 0
+    while head < n and a[alo + head] == b[blo + head]:
+        head += 1
+    tail = 0
+    while tail < n - head and a[ahi - 1 - tail] == b[bhi - 1 - tail]:
+        tail += 1
+    return head, tail
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi):
+    """
+    Returns (i, j) pairs of lines occurring exactly once in a[alo:ahi] and once in b[blo:bhi].
+    Keeps the longest run of pairs that is in order on both sides, as patience diff does.
+    """
+    # Count occurrences of each line on both sides, remembering where it was seen
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, 0, i, None])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted((i, j) for count_a, count_b, i, j in counts.values() if count_a == 1 and count_b == 1)
+
+    # Longest increasing subsequence of j positions, by patience sorting
+    tops, tails, previous = [], [], []
+    for k, (_, j) in enumerate(pairs):
+        pile = bisect.bisect_left(tops, j)
+        previous.append(tails[pile - 1] if pile else None)
+        if pile == len(tops):
+            tops.append(j)
+            tails.append(k)
+        else:
+            tops[pile] = j
+            tails[pile] = k
+
+    anchors = []
+    k = tails[-1] if tails else None
+    while k is not None:
+        anchors.append(pairs[k])
+        k = previous[k]
+    anchors.reverse()
+    return anchors
+
+def _diff_region(a, b, alo, ahi, blo, bhi, codes):
+    """Appends opcodes for a[alo:ahi] -> b[blo:bhi], running SequenceMatcher on the part between common ends."""
+    head, tail = _common_ends(a, b, alo, ahi, blo, bhi)
+    _append(codes, "equal", alo, alo + head, blo, blo + head)
+
+    # Diff what's left, offsetting its opcodes back into full-sequence positions
+    alo, blo = alo + head, blo + head
+    matcher = difflib.SequenceMatcher(None, a[alo:ahi - tail], b[blo:bhi - tail])
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        _append(codes, tag, i1 + alo, i2 + alo, j1 + blo, j2 + blo)
+
+    _append(codes, "equal", ahi - tail, ahi, bhi - tail, bhi)
+
+def _opcodes(a, b):
+    """
+    Returns difflib-style opcodes transforming line list a into line list b.
+    Lines shared at the start and end are matched directly. The rest is split at lines
+    that are unique on both sides (patience diff anchors), so SequenceMatcher, which is
+    quadratic or worse on repetitive input, only runs on the small gaps between anchors.
+    """
+    codes = []
+    head, tail = _common_ends(a, b, 0, len(a), 0, len(b))
+    _append(codes, "equal", 0, head, 0, head)
+
+    i, j = head, head
+    for anchor_i, anchor_j in _unique_anchors(a, b, head, len(a) - tail, head, len(b) - tail):
+        _diff_region(a, b, i, anchor_i, j, anchor_j, codes)
+        _append(codes, "equal", anchor_i, anchor_i + 1, anchor_j, anchor_j + 1)
+        i, j = anchor_i + 1, anchor_j + 1
+    _diff_region(a, b, i, len(a) - tail, j, len(b) - tail, codes)
+
+    _append(codes, "equal", len(a) - tail, len(a), len(b) - tail, len(b))
+    return codes
+
+def _grouped_opcodes(codes, n=3):
+    """
+    Groups opcodes into hunks with up to n lines of context.
+    Mirrors difflib.SequenceMatcher.get_grouped_opcodes.
+    """
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+
+    # Trim context from the leading and trailing equal runs
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    # Split the sequence into hunks wherever an equal run is longer than 2n lines
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+def _format_range(start, stop):
+    """Formats a hunk range the way unified diffs expect (1-based, length omitted when 1)."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1  # Empty ranges begin at the line just before the range
+    return f"{beginning},{length}"
+
+def unified_diff(a, b, fromfile="", tofile="", n=3):
+    """
+    Yields a unified diff between line lists a and b.
+    Produces the same format as difflib.unified_diff, but only runs the
+    sequence matcher over small regions of the inputs that differ.
+    """
+    started = False
+    for group in _grouped_opcodes(_opcodes(a, b), n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
@@ -1,16 +1,84 @@
 import os
 import logging
+import hashlib
+import shutil
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from davai.code_block import Head, Body, CodeBlock
 from davai.assets import Assets
 
+def _create_temp_file(filepath):
+    """
+    Creates an empty, hidden temporary file next to filepath and returns its path and descriptor.
+    It's opened with the usual 0o666 mode, so the process umask applies as it would to a plain open().
+    """
+    directory, name = os.path.split(filepath)
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return tmp_path, os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            continue
+
+def _write_atomic(filepath, content):
+    """
+    Writes content to a temporary file next to filepath and swaps it in with os.replace,
+    so the file is never left half written. A symlink is followed, so its target is
+    rewritten rather than the link replaced. An existing file's mode is kept.
+    """
+    filepath = os.path.realpath(filepath)
+    tmp_path, fd = _create_temp_file(filepath)
+    try:
+        with open(fd, 'w') as tmp_file:
+            tmp_file.write(content)
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    finally:
+        # Still there only if something failed before the replace
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _iter_files(root):
+    """Yields the path of every file below root, walking directories with os.scandir."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                else:
+                    yield entry.path
+
+def _read_file(filepath):
+    """Returns the text content of a file along with its stat result."""
+    with open(filepath, 'r') as file:
+        return file.read(), os.fstat(file.fileno())
+
+def _digest(content):
+    """Returns a short hash of some text content."""
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
 class Git:
+    MAX_READ_WORKERS = 16  # Threads used to read files in parallel during fetch
+
     def __init__(self, root):
         self.root = root
         self.assets = Assets()  # A list to hold CodeBlock objects
         self.commits = []  # List of commits (snapshots of assets)
         self.head = -1  # Index of the current commit (-1 means no commits yet)
         self.redo_stack = []  # Stack for redo operations
+        self.shared = False  # True while self.assets is also referenced by a commit
+        self.disk_state = {}  # Maps file paths to (mtime, size, content hash) as last read or written
 
+    def _writable_assets(self):
+        """Returns the working assets, copying them first if a commit still references them."""
+        if self.shared:
+            self.assets = self.assets.copy()
+            self.shared = False
+        return self.assets
 
     def add_asset(self, filename, content):
         """Adds or updates an asset (file)."""
@@ -18,25 +86,29 @@ class Git:
         body = Body(content)
         new_code_block = CodeBlock(head, body)
 
+        assets = self._writable_assets()
+
         # Check if the file is already in assets, if so update it
-        for i, asset in enumerate(self.assets):
-            if asset.head.path == filename:
-                self.assets[i] = new_code_block
-                logging.info(f"Updated asset: {filename}")
-                return
-        
+        i = assets.position(filename)
+        if i is not None:
+            assets[i] = new_code_block
+            logging.info("Updated asset: %s", filename)
+            return
+
         # If it's a new asset, add it to the assets list
-        self.assets.append(new_code_block)
-        logging.info(f"Added asset: {filename}")
+        assets.append(new_code_block)
+        logging.info("Added asset: %s", filename)
 
     def remove_asset(self, filename):
         """Removes an asset (file)."""
-        self.assets = [asset for asset in self.assets if asset.head.path != filename]
+        self.assets = Assets(asset for asset in self.assets if asset.head.path != filename)
+        self.shared = False
         logging.info(f"Removed asset: {filename}")
 
     def commit(self, message):
         """Commits the current state of assets."""
-        snapshot = self.assets.copy()  # Copy the current state of the assets
+        snapshot = self.assets  # Share the current assets; they are copied on the next write
+        self.shared = True
         self.commits = self.commits[:self.head + 1]  # Discard any redo history
         self.commits.append((snapshot, message))  # Save the snapshot with a message
         self.head += 1  # Move the head to the latest commit
@@ -48,7 +120,8 @@ class Git:
         if self.head > 0:
             self.redo_stack.append(self.commits[self.head])
             self.head -= 1
-            self.assets = self.commits[self.head][0].copy()  # Restore assets from the previous commit
+            self.assets = self.commits[self.head][0]  # Restore assets from the previous commit
+            self.shared = True
             logging.info(f"Undo: Moved to commit {self.head}")
         else:
             logging.info("No more commits to undo.")
@@ -59,7 +132,8 @@ class Git:
             redo_commit = self.redo_stack.pop()
             self.head += 1
             self.commits.append(redo_commit)
-            self.assets = redo_commit[0].copy()  # Restore assets from the redo commit
+            self.assets = redo_commit[0]  # Restore assets from the redo commit
+            self.shared = True
             logging.info(f"Redo: Moved to commit {self.head}")
         else:
             logging.info("No commits to redo.")
@@ -74,23 +148,42 @@ class Git:
         """Displays the current state of assets."""
         logging.info("Current assets:")
         for asset in self.assets:
-            logging.info(f"  {asset.head.path}: {repr(asset.body)}")
+            logging.info("  %s: %r", asset.head.path, asset.body)
 
     def fetch(self):
         """Recursively fetches files from the root directory and adds them as assets."""
         if os.path.exists(self.root):
-            for dirpath, _, filenames in os.walk(self.root):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    with open(filepath, 'r') as file:
-                        content = file.read()
-                        # Use absolute path with root for consistency
-                        relative_path = os.path.relpath(filepath, self.root)
-                        full_path = os.path.join(self.root, relative_path)
-                        self.add_asset(full_path, content)
+            filepaths = list(_iter_files(self.root))
+            # Reads are latency bound, so overlap them across threads
+            with ThreadPoolExecutor(max_workers=self.MAX_READ_WORKERS) as executor:
+                results = list(executor.map(_read_file, filepaths))
+            for filepath, (content, stat) in zip(filepaths, results):
+                self.disk_state[filepath] = (stat.st_mtime_ns, stat.st_size, _digest(content))
+                self.add_asset(filepath, content)
         else:
             logging.info(f"Root directory '{self.root}' does not exist.")
 
+    def _unchanged_on_disk(self, filepath, content):
+        """
+        Checks whether a file already holds the given content.
+        If the file's mtime and size match what was last read or written, the cached hash
+        is compared instead of reading the file back.
+        """
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return False
+
+        cached = self.disk_state.get(filepath)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2] == _digest(content)
+
+        # Unknown, or changed since we last saw it, so compare against the file itself
+        with open(filepath, 'r') as existing_file:
+            existing_content = existing_file.read()
+        self.disk_state[filepath] = (stat.st_mtime_ns, stat.st_size, _digest(existing_content))
+        return existing_content == content
+
     def push(self):
         """Saves assets to the file system, creating directories if necessary.
         Only writes the file if it's new or if the contents have changed.
@@ -107,21 +200,20 @@ class Git:
             filepath = os.path.join(self.root, relative_filename)
             directory = os.path.dirname(filepath)
             
-            # Check if the file exists and has the same content
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as existing_file:
-                    existing_content = existing_file.read()
-                    if existing_content == content:
-                        continue  # Skip if content is the same
+            # Skip if the file already has the same content
+            if self._unchanged_on_disk(filepath, content):
+                continue
 
             # If the file doesn't exist or the content has changed, write the file
             if not os.path.exists(directory):
                 os.makedirs(directory)  # Create directories if they don't exist
-                logging.info(f"Created directory: {directory}")
+                logging.info("Created directory: %s", directory)
 
-            with open(filepath, 'w') as file:
-                file.write(content)
-                logging.info(f"Written file: {filepath}")
+            # Write to a temporary file and swap it in, so the file is never left half written
+            _write_atomic(filepath, content)
+            stat = os.stat(filepath)
+            self.disk_state[filepath] = (stat.st_mtime_ns, stat.st_size, _digest(content))
+            logging.info("Written file: %s", filepath)
 
     def clean(self):
         """Removes assets from memory if the corresponding file doesn't exist on the filesystem."""
@@ -134,19 +226,19 @@ class Git:
 
         for asset in to_remove:
             self.remove_asset(asset.head.path)
-            logging.info(f"Purged asset: {asset.head.path}, as it doesn't exist in the filesystem.")
+            logging.info("Purged asset: %s, as it doesn't exist in the filesystem.", asset.head.path)
 
     def prune(self):
         """Removes files from the root directory if they are not present in the in-memory assets."""
         if os.path.exists(self.root):
-            for dirpath, _, filenames in os.walk(self.root):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    relative_path = os.path.relpath(filepath, self.root)
-                    full_path = os.path.join(self.root, relative_path)
-                    if full_path not in [asset.head.path for asset in self.assets]:
-                        os.remove(filepath)  # Delete the file from the filesystem
-                        logging.info(f"Deleted file: {filepath} (not found in assets)")
+            known_paths = set(self.assets.paths)  # Build the lookup once rather than per file
+
+            # Collect the files to delete first, so directories aren't modified while being walked
+            to_delete = [filepath for filepath in _iter_files(self.root) if filepath not in known_paths]
+
+            for filepath in to_delete:
+                os.remove(filepath)  # Delete the file from the filesystem
+                logging.info("Deleted file: %s (not found in assets)", filepath)
         else:
             logging.info(f"Root directory '{self.root}' does not exist.")
 
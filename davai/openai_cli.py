@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import httpx
 from davai.base_cli import BaseCLI
 from openai import OpenAI
 
@@ -13,25 +14,40 @@ if not api_key:
     logging.error("API key not found. Please set the 'OPENAI_API_KEY' environment variable.")
     sys.exit(1)
 
-# Create the OpenAI client
-Client = OpenAI(api_key=api_key)
+# Create the OpenAI client, keeping HTTP/2 connections alive so later calls skip the TLS handshake
+Client = OpenAI(api_key=api_key,
+                http_client=httpx.Client(http2=True,
+                                         limits=httpx.Limits(max_keepalive_connections=8)))
 
 def call_openai_api(request_text,
                     client=Client,
                     model_name="gpt-4o",
                     max_tokens=2000,
-                    temperature=0.7):
-    response = client.chat.completions.create(
+                    temperature=0.7,
+                    on_text=None):
+    # Stream the response, handing each piece of text to on_text (if given) as it arrives
+    stream = client.chat.completions.create(
         model=model_name,
         messages=[
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": request_text}
         ],
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        stream=True
     )
 
-    return response.choices[0].message.content
+    chunks = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if text:
+            chunks.append(text)
+            if on_text:
+                on_text(text)
+
+    return "".join(chunks)
 
 if __name__ == "__main__":
     # Check if a root directory is provided as a command line argument
@@ -1,11 +1,40 @@
 import os
 import logging
-from datetime import datetime
+import time
+from pathlib import Path
+
+# Output directories already created this session, so save() can skip the makedirs call
+_created_dirs = set()
+
+# Fixed request text, joined once at import rather than rebuilt on every generate() call
+_UPDATE_PREAMBLE = "\n\n".join([
+    "Please analyze the following code blocks, then I will set a task for you.",
+    "The asset name will be contained as a comment in the first line of each code block.",
+    "It's important to echo these comments in the response code blocks, to aid code reintegration."
+])
+_UPDATE_POSTAMBLE = "\n\n".join([
+    "You don't need to return any comments; just returning code blocks is fine.",
+    "Please only return modified files; you don't need to echo any unchanged files."
+])
+_QUERY_PREAMBLE = "\n\n".join([
+    "Please analyze the following code blocks. I will set a task for you.",
+    "The asset name will be contained as a comment in the first line of each code block.",
+    "It's important to review these code blocks before responding to the query."
+])
+_QUERY_POSTAMBLE = "Please provide a textual explanation or analysis only. Do not return any code blocks or code snippets."
+_RESET_PREAMBLE = "\n\n".join([
+    "Please use the following code blocks as the latest versions of these files.",
+    "The asset name will be contained as a comment in the first line of each code block.",
+    "There is no need for further response beyond an acknowledgement."
+])
+_RESET_POSTAMBLE = "Please acknowledge that these files will now be considered the latest versions for any subsequent tasks."
 
 class BaseRequest:
     """
     Base class to handle generic API requests.
     """
+    __slots__ = ("request_text",)
+
     def __init__(self):
         self.request_text = None  # Holds the generated request text
 
@@ -20,19 +49,28 @@ class BaseRequest:
         """
         Save the generated request to a file in the specified directory (default: tmp/requests).
         """
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        if output_dir not in _created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_dirs.add(output_dir)
+        # Read the clock once; microseconds keep saves within the same second from overwriting each other
+        now = time.time()
+        timestamp = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime(now)) + f"-{int(now % 1 * 1e6):06d}"
         request_filename = os.path.join(output_dir, f"request_{timestamp}.txt")
-        with open(request_filename, 'w') as request_file:
-            request_file.write(self.request_text)
-        logging.info(f"Request saved to {request_filename}")
+        try:
+            Path(request_filename).write_text(self.request_text, encoding="utf-8")
+        except FileNotFoundError:
+            # The directory was removed after it was cached as created
+            os.makedirs(output_dir, exist_ok=True)
+            Path(request_filename).write_text(self.request_text, encoding="utf-8")
+        logging.info("Request saved to %s", request_filename)
 
 class CodeUpdateRequest(BaseRequest):
     """
     Class to handle task-specific API requests.
     Inherits from BaseRequest and extends it with task-related generation logic.
     """
+    __slots__ = ()
+
     def generate(self, prompt_text, assets):
         """
         Generates the task request based on the provided prompt text and assets.
@@ -41,21 +79,18 @@ class CodeUpdateRequest(BaseRequest):
         
         # Include preamble if assets exist
         if assets:
-            buf.append("Please analyze the following code blocks, then I will set a task for you.")
-            buf.append("The asset name will be contained as a comment in the first line of each code block.")
-            buf.append("It's important to echo these comments in the response code blocks, to aid code reintegration.")
+            buf.append(_UPDATE_PREAMBLE)
 
-            # Rendering each code block now automatically includes the code type and backticks
-            for code_block in assets:
-                buf.append(repr(code_block))
+            # Rendering each code block now automatically includes the code type and backticks;
+            # identical blocks (same path and code) passed more than once are only included once
+            buf.extend(dict.fromkeys(map(repr, assets)))
             buf.append("---")
         
         # Always include the user request
         buf.append(prompt_text)
         
         # Add the postamble for code integration instructions
-        buf.append("You don't need to return any comments; just returning code blocks is fine.")
-        buf.append("Please only return modified files; you don't need to echo any unchanged files.")
+        buf.append(_UPDATE_POSTAMBLE)
         
         # Call the parent's generate method to store the generated request text
         super().generate("\n\n".join(buf))
@@ -65,6 +100,8 @@ class CodeQueryRequest(BaseRequest):
     Class to handle code query API requests.
     Inherits from BaseRequest and extends it with query-specific generation logic.
     """
+    __slots__ = ()
+
     def generate(self, prompt_text, assets):
         """
         Generates the query request based on the provided prompt text and assets.
@@ -73,20 +110,17 @@ class CodeQueryRequest(BaseRequest):
         
         # Include preamble if assets exist
         if assets:
-            buf.append("Please analyze the following code blocks. I will set a task for you.")
-            buf.append("The asset name will be contained as a comment in the first line of each code block.")
-            buf.append("It's important to review these code blocks before responding to the query.")
+            buf.append(_QUERY_PREAMBLE)
 
             # Rendering each code block now automatically includes the code type and backticks
-            for code_block in assets:
-                buf.append(repr(code_block))
+            buf.extend(map(repr, assets))
             buf.append("---")
         
         # Always include the user request
         buf.append(prompt_text)
         
         # Add the postamble instructing to reply in text only
-        buf.append("Please provide a textual explanation or analysis only. Do not return any code blocks or code snippets.")
+        buf.append(_QUERY_POSTAMBLE)
         
         # Call the parent's generate method to store the generated request text
         super().generate("\n\n".join(buf))
@@ -96,6 +130,8 @@ class CodeResetRequest(BaseRequest):
     Class to handle code reset API requests.
     Inherits from BaseRequest and extends it with reset-specific generation logic.
     """
+    __slots__ = ()
+
     def generate(self, assets):
         """
         Generates the reset request based on the provided assets.
@@ -104,17 +140,14 @@ class CodeResetRequest(BaseRequest):
         
         # Include preamble indicating that these code blocks should be used as the latest versions
         if assets:
-            buf.append("Please use the following code blocks as the latest versions of these files.")
-            buf.append("The asset name will be contained as a comment in the first line of each code block.")
-            buf.append("There is no need for further response beyond an acknowledgement.")
+            buf.append(_RESET_PREAMBLE)
 
             # Rendering each code block now automatically includes the code type and backticks
-            for code_block in assets:
-                buf.append(repr(code_block))
+            buf.extend(map(repr, assets))
             buf.append("---")
 
         # Add the postamble indicating there is no need for further action beyond acknowledgement
-        buf.append("Please acknowledge that these files will now be considered the latest versions for any subsequent tasks.")
+        buf.append(_RESET_POSTAMBLE)
         
         # Call the parent's generate method to store the generated request text
         super().generate("\n\n".join(buf))
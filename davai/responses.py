@@ -1,14 +1,74 @@
 import os
 import logging
-import re
-from datetime import datetime
+import time
+import string
+from pathlib import Path
+from functools import lru_cache
 from davai.assets import Assets
 from davai.code_block import CodeBlock
 
+# Output directories already created this session, so save() can skip the makedirs call
+_created_dirs = set()
+
+def _iter_fenced_blocks(text):
+    """
+    Yields the content of each fenced Markdown code block in the text.
+    An opening fence is ``` followed by an optional lowercase language name and a newline;
+    the block ends at the next line starting with ```. Scans with str.find rather than a regex.
+    """
+    pos = 0
+    while True:
+        start = text.find("```", pos)
+        if start < 0:
+            return
+        newline = text.find("\n", start + 3)
+        if newline < 0:
+            return
+
+        # Not an opening fence. A later fence on this line has to start after the last character
+        # that isn't a lowercase letter, so resume there rather than retrying every position
+        language = text[start + 3:newline]
+        if language and not (language.isascii() and language.isalpha() and language.islower()):
+            pos = max(start + 1, start + len(language.rstrip(string.ascii_lowercase)))
+            continue
+
+        end = text.find("\n```", newline + 1)
+        if end < 0:
+            return
+        yield text[newline + 1:end]
+        pos = end + 4
+
+def _parse_fenced_block(fenced_block):
+    """Returns the (Head, Body) pair of a fenced block text that names its asset, or None if it doesn't."""
+    code_block = CodeBlock.parse(fenced_block)
+    return (code_block.head, code_block.body) if code_block else None
+
+@lru_cache(maxsize=32)
+def _parse_fenced_blocks(response_text):
+    """
+    Returns the (Head, Body) pair, or None, for each fenced code block in a response text.
+    Memoized on the text, since the same response is often extracted more than once in a session.
+    Heads and Bodies are immutable, so they are shared; callers wrap them in new CodeBlocks.
+    """
+    return tuple(map(_parse_fenced_block, _iter_fenced_blocks(response_text)))
+
+def _iter_code_blocks(parsed_blocks):
+    """
+    Yields a new CodeBlock for each parsed (Head, Body) pair, warning about the blocks that don't name their asset.
+    Given a lazy iterable, blocks are parsed one at a time, so callers that stop early skip parsing the rest.
+    """
+    for i, parsed_block in enumerate(parsed_blocks):
+        if parsed_block:
+            yield CodeBlock(*parsed_block)
+        else:
+            logging.warning("Code block %d: No asset name comment found in the first line.", i+1)
+
 class BaseResponse:
     """
     Base class to handle generic API responses.
     """
+    __slots__ = ("response_text",)
+
     def __init__(self, response_text):
         self.response_text = response_text
 
@@ -16,32 +76,50 @@ class BaseResponse:
         """
         Save the response text to a file in the specified directory (default: tmp/responses).
         """
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        if output_dir not in _created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_dirs.add(output_dir)
+        # Read the clock once; microseconds keep saves within the same second from overwriting each other
+        now = time.time()
+        timestamp = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime(now)) + f"-{int(now % 1 * 1e6):06d}"
         response_filename = os.path.join(output_dir, f"response_{timestamp}.txt")
-        with open(response_filename, 'w') as response_file:
-            response_file.write(self.response_text)
-        logging.info(f"Response saved to {response_filename}")
+        try:
+            Path(response_filename).write_text(self.response_text, encoding="utf-8")
+        except FileNotFoundError:
+            # The directory was removed after it was cached as created
+            os.makedirs(output_dir, exist_ok=True)
+            Path(response_filename).write_text(self.response_text, encoding="utf-8")
+        logging.info("Response saved to %s", response_filename)
 
 class CodeResponse(BaseResponse):
     """
     Class to handle API responses containing code blocks.
     Inherits from BaseResponse and adds functionality to extract and process code blocks.
     """
+    __slots__ = ("_assets",)
+
+    def __init__(self, response_text):
+        super().__init__(response_text)
+        self._assets = None  # Cached result of extract_code_blocks()
+
+    def iter_code_blocks(self):
+        """
+        Iterates over the code blocks in the response text, parsing them lazily.
+        Uses the extracted assets instead once extract_code_blocks() has been called.
+        """
+        if self._assets is not None:
+            return iter(self._assets)
+        return _iter_code_blocks(map(_parse_fenced_block, _iter_fenced_blocks(self.response_text)))
+
     def extract_code_blocks(self):
         """
         Extracts code blocks from the response text.
-        Returns an instance of Assets (a list of CodeBlock objects).
+        Returns an instance of Assets (a list of CodeBlock objects), built once per response.
         """
-        assets = Assets()
-        code_blocks = re.findall(r"```[a-z]*\n(.*?)\n```", self.response_text, re.DOTALL)
-
-        for i, code_block in enumerate(code_blocks):
-            parsed_code_block = CodeBlock.parse(code_block)
-            if parsed_code_block:
-                assets.append(parsed_code_block)
+        if self._assets is None:
+            if "```" not in self.response_text:
+                # No fences at all, as in plain answers; don't take up a slot in the parse cache
+                self._assets = Assets()
             else:
-                logging.warning(f"Code block {i+1}: No asset name comment found in the first line.")
-        
-        return assets
+                self._assets = Assets(_iter_code_blocks(_parse_fenced_blocks(self.response_text)))
+        return self._assets
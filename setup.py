@@ -73,6 +73,7 @@ setuptools.setup(
     # packages=setuptools.find_packages(),
     packages=filter_packages("davai"),
     install_requires=requirements,
+    python_requires=">=3.10",  # Head and Body use @dataclass(slots=True)
     # - https://stackoverflow.com/a/57932258/124179
     setup_requires=['setuptools_scm'],
     include_package_data=True
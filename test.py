@@ -2,11 +2,34 @@ import unittest
 import os
 import sys
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+def _iter_py(directory):
+    """
+    Recursively yield the paths of Python files below a directory.
+    Uses os.scandir, whose entries already know whether they are directories.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_py(entry.path)
+            elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+def _import_one(test_file, test_dir):
+    """Import a test module from its file, naming it after its path relative to the test directory."""
+    module_name = os.path.splitext(os.path.relpath(test_file, test_dir))[0].replace(os.sep, ".")
+    spec = importlib.util.spec_from_file_location(module_name, test_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 def discover_and_run_tests(test_dir="tests"):
     """
     Discover and run all test cases in the specified directory.
     Recursively finds all classes extending unittest.TestCase and executes them.
+    Modules are loaded from their files rather than through TestLoader.discover, since
+    discover would register names like requests and git as top-level modules.
     """
     # Ensure the test directory is in the Python path
     sys.path.insert(0, os.path.abspath(test_dir))
@@ -14,26 +37,15 @@ def discover_and_run_tests(test_dir="tests"):
     # Test suite to hold all tests
     suite = unittest.TestSuite()
 
-    # Recursively walk through the test directory
-    for root, _, files in os.walk(test_dir):
-        for file in files:
-            # Only consider Python files
-            if file.endswith(".py"):
-                test_file = os.path.join(root, file)
-
-                # Import the module dynamically
-                module_name = os.path.splitext(os.path.relpath(test_file, test_dir))[0].replace(os.sep, ".")
-                spec = importlib.util.spec_from_file_location(module_name, test_file)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                # Iterate through attributes in the module to find TestCase classes
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if isinstance(attr, type) and issubclass(attr, unittest.TestCase):
-                        # Add the discovered test case class to the test suite
-                        tests = unittest.defaultTestLoader.loadTestsFromTestCase(attr)
-                        suite.addTests(tests)
+    # Recursively walk through the test directory, considering only Python files,
+    # and import the modules in parallel so their file reads and compiles overlap
+    test_files = list(_iter_py(test_dir))
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        modules = list(executor.map(_import_one, test_files, [test_dir] * len(test_files)))
+
+    # Let the loader collect every TestCase class, back on the main thread and in file order
+    for module in modules:
+        suite.addTests(unittest.defaultTestLoader.loadTestsFromModule(module))
 
     # Run the test suite and output the results
     runner = unittest.TextTestRunner(verbosity=2)
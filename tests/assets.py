@@ -1,5 +1,7 @@
 import unittest
 import os
+import copy
+import pickle
 from davai.code_block import CodeBlock, Head, Body
 from davai.assets import Assets
 
@@ -22,6 +24,27 @@ class AssetsTest(unittest.TestCase):
         expected_paths = ["src/App.js", "src/styles.css", "src/Content.ts", "src/DeleteModal.js"]
         self.assertEqual(self.assets.paths, expected_paths)
 
+    def test_paths_after_mutation(self):
+        """Test if the paths property stays correct as assets are appended and removed."""
+        self.assertEqual(len(self.assets.paths), 4)
+        self.assets.append(CodeBlock(Head("src/Header.js"), Body("export const Header = () => null;")))
+        self.assertEqual(self.assets.paths[-1], "src/Header.js")
+        self.assets.pop(0)
+        self.assertEqual(self.assets.paths, ["src/styles.css", "src/Content.ts", "src/DeleteModal.js", "src/Header.js"])
+
+    def test_paths_after_get(self):
+        """Test if building the position index leaves already cached paths alone."""
+        expected_paths = list(self.assets.paths)
+        self.assets.get("src/App.js")
+        self.assertEqual(self.assets.paths, expected_paths)
+
+    def test_paths_of_copy(self):
+        """Test if adding to a copy leaves the original's cached paths alone."""
+        expected_paths = list(self.assets.paths)
+        for copied in (copy.copy(self.assets), self.assets.copy()):
+            copied.append(CodeBlock(Head("src/Header.js"), Body("export const Header = () => null;")))
+            self.assertEqual(self.assets.paths, expected_paths)
+
     def test_match_exact(self):
         """Test if match method returns exact matches correctly."""
         matched_assets = self.assets.match("App")
@@ -45,5 +68,74 @@ class AssetsTest(unittest.TestCase):
         matched_assets = self.assets.match("nonexistent")
         self.assertEqual(len(matched_assets), 0)
 
+    def test_match_empty(self):
+        """Test if an empty query matches no assets."""
+        self.assertEqual(len(self.assets.match("")), 0)
+        self.assertEqual(len(self.assets.match_many([""])[0]), 0)
+
+    def test_match_typo(self):
+        """Test if match method accepts a one-typo query at the default threshold."""
+        self.assets.append(CodeBlock(Head("src/Settings.js"), Body("export const settings = {};")))
+        matched_assets = self.assets.match("setings")  # partial_ratio 85.7 against "settings"
+        self.assertEqual(matched_assets.paths, ["src/Settings.js"])
+
+    def test_match_after_append(self):
+        """Test if match method sees assets appended after a previous match."""
+        self.assertEqual(len(self.assets.match("header")), 0)
+        self.assets.append(CodeBlock(Head("src/Header.js"), Body("export const Header = () => null;")))
+        matched_assets = self.assets.match("header")
+        self.assertEqual(len(matched_assets), 1)
+        self.assertEqual(matched_assets[0].head.path, "src/Header.js")
+
+    def test_match_prefers_substring(self):
+        """Test if fuzzy-only matches are skipped when an asset name appears in the text."""
+        self.assets.append(CodeBlock(Head("src/Header.js"), Body("export const Header = () => null;")))
+        self.assets.append(CodeBlock(Head("src/Headers.js"), Body("export const headers = {};")))
+        matched_assets = self.assets.match("update the header")
+        self.assertEqual(matched_assets.paths, ["src/Header.js"])
+        self.assertEqual(self.assets.match_many(["update the header"])[0].paths, ["src/Header.js"])
+
+    def test_match_many(self):
+        """Test if match_many returns the same assets as matching each text separately."""
+        texts = ["App", "delete", "nonexistent", "change the styles"]
+        results = self.assets.match_many(texts)
+        self.assertEqual(len(results), len(texts))
+        for text, matched_assets in zip(texts, results):
+            self.assertEqual(matched_assets.paths, self.assets.match(text).paths)
+
+    def test_get(self):
+        """Test if get returns the asset for a path, or None for an unknown path."""
+        self.assertEqual(self.assets.get("src/styles.css").body.code, "body { background-color: black; }")
+        self.assertIsNone(self.assets.get("src/Missing.js"))
+
+    def test_position_after_mutation(self):
+        """Test if position stays correct as assets are appended and deleted."""
+        self.assertEqual(self.assets.position("src/DeleteModal.js"), 3)
+        del self.assets[0]
+        self.assertEqual(self.assets.position("src/DeleteModal.js"), 2)
+        self.assertIsNone(self.assets.position("src/App.js"))
+        self.assets.append(CodeBlock(Head("src/App.js"), Body("console.log('Back again');")))
+        self.assertEqual(self.assets.position("src/App.js"), 3)
+
+    def test_lookups_after_imul(self):
+        """Test if cached lookups are rebuilt after the list is repeated in place."""
+        self.assertEqual(len(self.assets.paths), 4)
+        self.assertEqual(len(self.assets.choices), 4)
+        self.assets *= 2
+        self.assertEqual(len(self.assets.paths), 8)
+        self.assertEqual(len(self.assets.choices), 8)
+        self.assets *= 0
+        self.assertEqual(self.assets.paths, [])
+        self.assertIsNone(self.assets.position("src/App.js"))
+
+    def test_pickle_and_deepcopy(self):
+        """Test if pickled and deep-copied Assets come back with the same items and fresh lookups."""
+        expected_paths = list(self.assets.paths)
+        self.assets.position("src/App.js")
+        for restored in (pickle.loads(pickle.dumps(self.assets)), copy.deepcopy(self.assets)):
+            self.assertIsInstance(restored, Assets)
+            self.assertEqual(restored.paths, expected_paths)
+            self.assertEqual(restored.position("src/DeleteModal.js"), 3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from dataclasses import FrozenInstanceError
 from davai.code_block import Head, Body, CodeBlock
 
 class CodeBlockTest(unittest.TestCase):
@@ -17,6 +18,16 @@ class CodeBlockTest(unittest.TestCase):
         self.assertEqual(head.path, "src/styles.css")
         self.assertEqual(head.code_type, "css")
 
+    def test_head_from_comment_ts_and_dart(self):
+        self.assertEqual(Head.from_comment("// src/content.ts").code_type, "typescript")
+        self.assertEqual(Head.from_comment("//src/lib/main.dart").path, "src/lib/main.dart")
+
+    def test_head_from_comment_mismatched_style(self):
+        # CSS paths need block comments, and JS paths line comments
+        self.assertIsNone(Head.from_comment("// src/styles.css"))
+        self.assertIsNone(Head.from_comment("/* src/example.js */"))
+        self.assertIsNone(Head.from_comment("// lib/example.js"))
+
     def test_head_from_comment_invalid(self):
         comment = "# some other comment"
         head = Head.from_comment(comment)
@@ -39,6 +50,20 @@ class CodeBlockTest(unittest.TestCase):
         expected_body = "line_of_code_1();\nline_of_code_2();"
         self.assertEqual(body.code.strip(), expected_body)
 
+    def test_body_lines(self):
+        body = Body("line_of_code_1();\nline_of_code_2();")
+        self.assertEqual(body.lines, ["line_of_code_1();\n", "line_of_code_2();"])
+        self.assertIs(body.lines, body.lines)
+
+    def test_head_and_body_immutable(self):
+        head = Head("".join(["src/", "example.js"]))  # Built at runtime, so not interned by the compiler
+        self.assertIs(head.path, Head("src/example.js").path)  # Paths are interned
+        self.assertEqual(head, Head("src/example.js"))
+        with self.assertRaises(FrozenInstanceError):
+            head.path = "src/other.js"
+        with self.assertRaises(FrozenInstanceError):
+            Body("example();").code = "updated();"
+
     def test_code_block_parsing_js(self):
         code_block = """
         // src/Example.js
@@ -74,6 +99,15 @@ class CodeBlockTest(unittest.TestCase):
         repr_string = repr(code_block).strip()
         self.assertTrue("// src/Example.js" in repr_string)
         self.assertTrue("function example()" in repr_string)
-        
+
+    def test_code_block_representation_cached(self):
+        code_block = CodeBlock(Head("src/Example.js"), Body("example();"))
+        self.assertIs(repr(code_block), repr(code_block))
+
+        # Replacing the body must invalidate the cached rendering
+        code_block.body = Body("updated();")
+        self.assertIn("updated();", repr(code_block))
+        self.assertNotIn("example();", repr(code_block))
+
 if __name__ == "__main__":
     unittest.main()
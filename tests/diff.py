@@ -0,0 +1,53 @@
+import unittest
+import difflib
+from davai.diff import unified_diff
+
+class DiffTest(unittest.TestCase):
+    def setUp(self):
+        """Set up a reasonably sized source file to diff against."""
+        self.old_lines = [f"const line{i} = {i};\n" for i in range(100)]
+
+    def assert_matches_difflib(self, old_lines, new_lines):
+        """Helper asserting the output is identical to difflib.unified_diff."""
+        expected = list(difflib.unified_diff(old_lines, new_lines, fromfile="old_code", tofile="new_code"))
+        actual = list(unified_diff(old_lines, new_lines, fromfile="old_code", tofile="new_code"))
+        self.assertEqual(actual, expected)
+
+    def test_identical(self):
+        """Test that identical inputs produce no diff at all."""
+        self.assertEqual(list(unified_diff(self.old_lines, list(self.old_lines))), [])
+
+    def test_replace(self):
+        """Test a single changed line in the middle of the file."""
+        new_lines = list(self.old_lines)
+        new_lines[50] = "const line50 = 'changed';\n"
+        self.assert_matches_difflib(self.old_lines, new_lines)
+
+    def test_insert_and_delete(self):
+        """Test separate insertions and deletions producing multiple hunks."""
+        new_lines = list(self.old_lines)
+        new_lines.insert(10, "// inserted\n")
+        del new_lines[80]
+        self.assert_matches_difflib(self.old_lines, new_lines)
+
+    def test_edges(self):
+        """Test changes touching the first and last lines."""
+        new_lines = ["// header\n"] + self.old_lines[1:-1] + ["// footer\n"]
+        self.assert_matches_difflib(self.old_lines, new_lines)
+
+    def test_repetitive(self):
+        """Test a change among repeated boilerplate lines, split up by unique anchor lines."""
+        old_lines = []
+        for i in range(20):
+            old_lines += [f"function handler{i}() {{\n", "    return null;\n", "}\n"]
+        new_lines = list(old_lines)
+        new_lines[31] = "    return true;\n"
+        self.assert_matches_difflib(old_lines, new_lines)
+
+    def test_empty(self):
+        """Test diffing from and to an empty file."""
+        self.assert_matches_difflib([], self.old_lines[:5])
+        self.assert_matches_difflib(self.old_lines[:5], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 import os
 import shutil
+import stat
+from unittest import mock
 from davai.git import Git
 
 class GitTest(unittest.TestCase):
@@ -65,6 +67,20 @@ class GitTest(unittest.TestCase):
         self.assertEqual(self.git.commits[0][1], "Initial commit")
         self.assertEqual(len(self.git.commits[0][0]), 1)  # One asset in the snapshot
 
+    def test_commit_snapshot_unchanged_by_later_writes(self):
+        self.create_file("file1.txt", "Hello World!")
+        self.git.fetch()
+        self.git.commit("Initial commit")
+
+        self.git.add_asset(os.path.join(self.TMP_DIR, "file1.txt"), "Updated Hello World!")
+        self.git.add_asset(os.path.join(self.TMP_DIR, "file2.txt"), "Another file content")
+
+        # Assert that the committed snapshot still holds the original state
+        snapshot = self.git.commits[0][0]
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot[0].body.code, "Hello World!")
+        self.assertEqual(len(self.git.assets), 2)
+
     def test_undo_redo(self):
         self.create_file("file1.txt", "Hello World!")
         self.git.fetch()
@@ -100,13 +116,85 @@ class GitTest(unittest.TestCase):
         self.git.fetch()
 
         # Change the content of file1.txt and push it
-        self.git.assets[0].body.code = "Updated Hello World!"
+        self.git.add_asset(os.path.join(self.TMP_DIR, "file1.txt"), "Updated Hello World!")
         self.git.push()
 
         # Assert that the file system reflects the updated content
         with open(os.path.join(self.TMP_DIR, "file1.txt"), 'r') as file:
             self.assertEqual(file.read(), "Updated Hello World!")
 
+    def test_push_skips_unchanged(self):
+        self.create_file("file1.txt", "Hello World!")
+        self.git.fetch()
+        filepath = os.path.join(self.TMP_DIR, "file1.txt")
+        mtime = os.stat(filepath).st_mtime_ns
+
+        self.git.push()
+
+        # Assert that the unchanged file was not rewritten
+        self.assertEqual(os.stat(filepath).st_mtime_ns, mtime)
+
+    def test_push_after_external_change(self):
+        self.create_file("file1.txt", "Hello World!")
+        self.git.fetch()
+
+        # Change the file behind git's back, then push the in-memory version
+        self.create_file("file1.txt", "Changed outside the CLI")
+        self.git.push()
+
+        # Assert that the file system reflects the in-memory content again
+        with open(os.path.join(self.TMP_DIR, "file1.txt"), 'r') as file:
+            self.assertEqual(file.read(), "Hello World!")
+
+    def test_push_keeps_file_mode(self):
+        self.create_file("script.sh", "echo hello")
+        filepath = os.path.join(self.TMP_DIR, "script.sh")
+        os.chmod(filepath, 0o755)
+        self.git.fetch()
+
+        self.git.add_asset(filepath, "echo updated")
+        self.git.push()
+
+        # Assert that the rewritten file is still executable
+        self.assertEqual(stat.S_IMODE(os.stat(filepath).st_mode), 0o755)
+
+    def test_push_follows_symlink(self):
+        self.create_file("target.txt", "Hello World!")
+        link_path = os.path.join(self.TMP_DIR, "link.txt")
+        os.symlink("target.txt", link_path)
+        self.git.fetch()
+
+        self.git.add_asset(link_path, "Hello Link!")
+        self.git.push()
+
+        # Assert that the link is still a link, and its target got the new content
+        self.assertTrue(os.path.islink(link_path))
+        with open(os.path.join(self.TMP_DIR, "target.txt"), 'r') as file:
+            self.assertEqual(file.read(), "Hello Link!")
+
+    def test_push_new_file_uses_umask(self):
+        filepath = os.path.join(self.TMP_DIR, "new_file.txt")
+        self.git.add_asset(filepath, "New content")
+        old_umask = os.umask(0o027)
+        try:
+            self.git.push()
+        finally:
+            os.umask(old_umask)
+
+        # Assert that the new file got the default mode less the umask
+        self.assertEqual(stat.S_IMODE(os.stat(filepath).st_mode), 0o640)
+
+    def test_push_leaves_no_temporary_file(self):
+        self.create_file("file1.txt", "Hello World!")
+        self.git.fetch()
+        self.git.add_asset(os.path.join(self.TMP_DIR, "file1.txt"), "Updated Hello World!")
+
+        # Make the swap fail, then check the temporary file was cleaned up
+        with mock.patch("davai.git.os.replace", side_effect=OSError("replace failed")):
+            with self.assertRaises(OSError):
+                self.git.push()
+        self.assertEqual(os.listdir(self.TMP_DIR), ["file1.txt"])
+
     def test_clean(self):
         self.create_file("file1.txt", "Hello World!")
         self.git.fetch()
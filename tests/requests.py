@@ -1,28 +1,44 @@
 import unittest
 import os
+import shutil
+import tempfile
+from pathlib import Path
 from datetime import datetime
 from davai.requests import BaseRequest, CodeUpdateRequest, CodeQueryRequest, CodeResetRequest
 from davai.code_block import CodeBlock, Head, Body
 
 class RequestsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for saving requests and the assets, shared by all tests."""
+        cls.test_output_dir = tempfile.mkdtemp(prefix="davai_req_")
+
+        # Create dummy CodeBlocks once; tests only read them, and each caches its rendering
+        cls.code_block_1 = CodeBlock(Head("src/App.js"), Body("console.log('Hello World');"))
+        cls.code_block_2 = CodeBlock(Head("src/styles.css"), Body("body { background-color: black; }"))
+        cls.assets = [cls.code_block_1, cls.code_block_2]
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory."""
+        shutil.rmtree(cls.test_output_dir, ignore_errors=True)
+
     def setUp(self):
-        """Set up test environment and assets."""
-        # Create a temporary directory for saving requests
-        self.test_output_dir = "tmp/test_requests"
-        if not os.path.exists(self.test_output_dir):
-            os.makedirs(self.test_output_dir)
-
-        # Create dummy CodeBlocks
-        self.code_block_1 = CodeBlock(Head("src/App.js"), Body("console.log('Hello World');"))
-        self.code_block_2 = CodeBlock(Head("src/styles.css"), Body("body { background-color: black; }"))
-        self.assets = [self.code_block_1, self.code_block_2]
-
-    def tearDown(self):
-        """Clean up the test environment."""
-        # Remove all files created during tests
-        for file in os.listdir(self.test_output_dir):
-            os.remove(os.path.join(self.test_output_dir, file))
-        os.rmdir(self.test_output_dir)
+        """Set up test environment."""
+        # Start each test with an empty output directory
+        for entry in os.scandir(self.test_output_dir):
+            os.unlink(entry.path)
+
+    def assert_saved(self, entry, expected):
+        """Helper asserting that a saved file holds exactly the expected text, checking its size first."""
+        expected_bytes = expected.encode("utf-8")
+        self.assertEqual(entry.stat().st_size, len(expected_bytes))
+        self.assertEqual(Path(entry.path).read_bytes(), expected_bytes)
+
+    def assert_contains_all(self, text, expected):
+        """Helper asserting that every expected substring is in the text, reporting all that are missing."""
+        missing = [substring for substring in expected if substring not in text]
+        self.assertFalse(missing, f"Missing from request text: {missing}")
 
     def test_base_request_generate(self):
         """Test that BaseRequest generates the request text correctly."""
@@ -39,14 +55,22 @@ class RequestsTest(unittest.TestCase):
         request.save(self.test_output_dir)
 
         # Check if the file was created
-        saved_files = os.listdir(self.test_output_dir)
+        saved_files = list(os.scandir(self.test_output_dir))
         self.assertEqual(len(saved_files), 1)
-        self.assertTrue(saved_files[0].startswith("request_"))
+        self.assertTrue(saved_files[0].name.startswith("request_"))
 
         # Check file content
-        with open(os.path.join(self.test_output_dir, saved_files[0]), 'r') as file:
-            file_content = file.read()
-            self.assertEqual(file_content, content)
+        self.assert_saved(saved_files[0], content)
+
+    def test_base_request_save_twice(self):
+        """Test that saving twice in quick succession creates two files."""
+        request = BaseRequest()
+        request.generate("Test content for saving")
+        request.save(self.test_output_dir)
+        request.save(self.test_output_dir)
+
+        # Check that the second save didn't overwrite the first
+        self.assertEqual(len(list(os.scandir(self.test_output_dir))), 2)
 
     def test_code_update_request_generate(self):
         """Test that CodeUpdateRequest generates the request text correctly with assets."""
@@ -55,10 +79,20 @@ class RequestsTest(unittest.TestCase):
         request.generate(prompt_text, self.assets)
 
         # Assert that the generated request includes both assets and the prompt text
-        self.assertIn("Please analyze the following code blocks", request.request_text)
-        self.assertIn("console.log('Hello World');", request.request_text)
-        self.assertIn("body { background-color: black; }", request.request_text)
-        self.assertIn("Update the code to improve performance.", request.request_text)
+        self.assert_contains_all(request.request_text, [
+            "Please analyze the following code blocks",
+            "console.log('Hello World');",
+            "body { background-color: black; }",
+            "Update the code to improve performance.",
+        ])
+
+    def test_code_update_request_generate_duplicates(self):
+        """Test that CodeUpdateRequest includes a code block passed twice only once."""
+        request = CodeUpdateRequest()
+        request.generate("Update the code.", self.assets + [self.code_block_1])
+
+        # Assert that the duplicated block appears once
+        self.assertEqual(request.request_text.count("console.log('Hello World');"), 1)
 
     def test_code_query_request_generate(self):
         """Test that CodeQueryRequest generates the request text correctly with assets."""
@@ -67,11 +101,13 @@ class RequestsTest(unittest.TestCase):
         request.generate(prompt_text, self.assets)
 
         # Assert that the generated request includes both assets and the prompt text
-        self.assertIn("Please analyze the following code blocks", request.request_text)
-        self.assertIn("What does this code do?", request.request_text)
-        self.assertIn("console.log('Hello World');", request.request_text)
-        self.assertIn("body { background-color: black; }", request.request_text)
-        self.assertIn("Please provide a textual explanation or analysis only.", request.request_text)
+        self.assert_contains_all(request.request_text, [
+            "Please analyze the following code blocks",
+            "What does this code do?",
+            "console.log('Hello World');",
+            "body { background-color: black; }",
+            "Please provide a textual explanation or analysis only.",
+        ])
 
     def test_code_reset_request_generate(self):
         """Test that CodeResetRequest generates the request text correctly with assets."""
@@ -79,10 +115,12 @@ class RequestsTest(unittest.TestCase):
         request.generate(self.assets)
 
         # Assert that the generated request includes both assets
-        self.assertIn("Please use the following code blocks as the latest versions of these files.", request.request_text)
-        self.assertIn("console.log('Hello World');", request.request_text)
-        self.assertIn("body { background-color: black; }", request.request_text)
-        self.assertIn("Please acknowledge that these files will now be considered the latest versions", request.request_text)
+        self.assert_contains_all(request.request_text, [
+            "Please use the following code blocks as the latest versions of these files.",
+            "console.log('Hello World');",
+            "body { background-color: black; }",
+            "Please acknowledge that these files will now be considered the latest versions",
+        ])
 
     def test_code_update_request_save(self):
         """Test that CodeUpdateRequest saves the request text to a file."""
@@ -92,14 +130,13 @@ class RequestsTest(unittest.TestCase):
         request.save(self.test_output_dir)
 
         # Check if the file was created
-        saved_files = os.listdir(self.test_output_dir)
+        saved_files = list(os.scandir(self.test_output_dir))
         self.assertEqual(len(saved_files), 1)
-        self.assertTrue(saved_files[0].startswith("request_"))
+        self.assertTrue(saved_files[0].name.startswith("request_"))
 
         # Check file content
-        with open(os.path.join(self.test_output_dir, saved_files[0]), 'r') as file:
-            file_content = file.read()
-            self.assertIn("Update the code to fix the bug.", file_content)
+        self.assert_saved(saved_files[0], request.request_text)
+        self.assertIn("Update the code to fix the bug.", request.request_text)
 
 if __name__ == '__main__':
     unittest.main()
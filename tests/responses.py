@@ -1,16 +1,29 @@
 import unittest
 import os
+import shutil
+import tempfile
+from pathlib import Path
 import re
 from datetime import datetime
 from davai.responses import BaseResponse, CodeResponse
 from davai.code_block import CodeBlock, Head, Body
 
 class ResponsesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary directory for saving responses, shared by all tests."""
+        cls.test_output_dir = tempfile.mkdtemp(prefix="davai_resp_")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared temporary directory."""
+        shutil.rmtree(cls.test_output_dir, ignore_errors=True)
+
     def setUp(self):
         """Set up the test environment and response text."""
-        self.test_output_dir = "tmp/test_responses"
-        if not os.path.exists(self.test_output_dir):
-            os.makedirs(self.test_output_dir)
+        # Start each test with an empty output directory
+        for entry in os.scandir(self.test_output_dir):
+            os.unlink(entry.path)
 
         # Sample response text containing code blocks
         self.sample_response_text = (
@@ -22,11 +35,11 @@ class ResponsesTest(unittest.TestCase):
             "Here is some text without code blocks. It contains explanations but no code."
         )
 
-    def tearDown(self):
-        """Clean up the test environment."""
-        for file in os.listdir(self.test_output_dir):
-            os.remove(os.path.join(self.test_output_dir, file))
-        os.rmdir(self.test_output_dir)
+    def assert_saved(self, entry, expected):
+        """Helper asserting that a saved file holds exactly the expected text, checking its size first."""
+        expected_bytes = expected.encode("utf-8")
+        self.assertEqual(entry.stat().st_size, len(expected_bytes))
+        self.assertEqual(Path(entry.path).read_bytes(), expected_bytes)
 
     def test_base_response_save(self):
         """Test that BaseResponse saves the response text to a file."""
@@ -34,14 +47,12 @@ class ResponsesTest(unittest.TestCase):
         response.save(self.test_output_dir)
 
         # Check if the file was created
-        saved_files = os.listdir(self.test_output_dir)
+        saved_files = list(os.scandir(self.test_output_dir))
         self.assertEqual(len(saved_files), 1)
-        self.assertTrue(saved_files[0].startswith("response_"))
+        self.assertTrue(saved_files[0].name.startswith("response_"))
 
         # Check file content
-        with open(os.path.join(self.test_output_dir, saved_files[0]), 'r') as file:
-            file_content = file.read()
-            self.assertEqual(file_content, "This is a sample response text.")
+        self.assert_saved(saved_files[0], "This is a sample response text.")
 
     def test_code_response_extract_code_blocks(self):
         """Test that CodeResponse correctly extracts code blocks."""
@@ -66,6 +77,67 @@ class ResponsesTest(unittest.TestCase):
         # Assert that no code blocks are extracted
         self.assertEqual(len(assets), 0)
 
+    def test_code_response_iter_code_blocks(self):
+        """Test that iter_code_blocks yields the same blocks as extract_code_blocks, one at a time."""
+        response = CodeResponse(self.sample_response_text)
+        code_blocks = response.iter_code_blocks()
+
+        # Take just the first block, then compare the full iteration with the extracted assets
+        self.assertEqual(next(code_blocks).head.path, "src/App.js")
+        self.assertEqual([code_block.head.path for code_block in response.iter_code_blocks()],
+                         response.extract_code_blocks().paths)
+
+    def test_code_response_extract_code_blocks_repeated(self):
+        """Test that responses with the same text get separate Assets and CodeBlock objects."""
+        first = CodeResponse(self.sample_response_text).extract_code_blocks()
+        second = CodeResponse(self.sample_response_text).extract_code_blocks()
+        self.assertIsNot(first[0], second[0])
+
+        # Assert that the text was parsed once, with the immutable Head and Body shared between results
+        self.assertIs(first[0].head, second[0].head)
+        self.assertIs(first[0].body, second[0].body)
+
+        # Assert that changing the first result did not affect the second
+        first.pop()
+        self.assertEqual(len(second), 2)
+        self.assertEqual(second.paths, ["src/App.js", "src/styles.css"])
+
+    def test_code_response_extract_code_blocks_repeated_warnings(self):
+        """Test that a block without an asset comment is warned about every time its text is parsed."""
+        invalid_response_text = "```javascript\nfunction example() {}\n```"
+        for _ in range(2):
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertEqual(len(CodeResponse(invalid_response_text).extract_code_blocks()), 0)
+            self.assertIn("No asset name comment", logs.output[0])
+
+    def test_code_response_extract_code_blocks_fences(self):
+        """Test that only fences with a lowercase language name (or none) open a code block."""
+        ignored_response_text = "```JSON\n// src/Ignored.js\nconst ignored = true;\n```"
+        self.assertEqual(len(CodeResponse(ignored_response_text).extract_code_blocks()), 0)
+
+        response_text = (
+            "```\n// src/App.js\nconst app = true;\n```\n"
+            "Trailing text with an unterminated ```js\nfence"
+        )
+        assets = CodeResponse(response_text).extract_code_blocks()
+
+        # Assert that the block with a bare fence is extracted, and the unterminated one is not
+        self.assertEqual(assets.paths, ["src/App.js"])
+        self.assertEqual(assets[0].body.code.strip(), "const app = true;")
+
+    def test_code_response_extract_code_blocks_pathological(self):
+        """Test that long runs of backticks and unterminated fences are scanned without stalling."""
+        response_text = (
+            "`" * 200000 + "X\n"
+            + "```JS\n" * 20000
+            + "```js\n// src/App.js\nconst app = true;\n```\n"
+            + "```js\nunterminated " * 20000
+        )
+        assets = CodeResponse(response_text).extract_code_blocks()
+
+        # Assert that only the one well-formed block is extracted
+        self.assertEqual(assets.paths, ["src/App.js"])
+
     def test_code_response_extract_code_blocks_invalid_blocks(self):
         """Test that CodeResponse handles cases where code blocks do not have valid comments."""
         invalid_response_text = (